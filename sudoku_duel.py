@@ -15,10 +15,86 @@ import tkinter as tk
 from tkinter import messagebox
 import heapq
 import random
-import copy
+import array
+
+# Numba is optional: without it the greedy kernel below runs as plain Python
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
+# Row, column and box index of each flat cell index, and the top-left cell of each box
+ROW_IDX = tuple(i // 9 for i in range(81))
+COL_IDX = tuple(i % 9 for i in range(81))
+BOX_OF = tuple((i // 27) * 3 + (i % 9) // 3 for i in range(81))
+BOX_TOPLEFT = tuple((3 * (b // 3), 3 * (b % 3)) for b in range(9))
+
+# BITS_OF[mask] lists the set bit positions (digit - 1) of a 9-bit candidate mask
+BITS_OF = tuple(tuple(i for i in range(9) if m >> i & 1) for m in range(512))
+# POP[mask] is the number of candidates in a 9-bit mask
+POP = bytes(bin(m).count("1") for m in range(512))
+# LOWEST[mask] is the position of the lowest set bit (digit - 1), 0 for an empty mask
+LOWEST = bytes((m & -m).bit_length() - 1 if m else 0 for m in range(512))
+
+def _build_neighbors():
+    table = []
+    for r in range(9):
+        for c in range(9):
+            br, bc = BOX_TOPLEFT[BOX_OF[r*9 + c]]
+            peers = {(r, i) for i in range(9)} | {(i, c) for i in range(9)}
+            peers |= {(i, j) for i in range(br, br + 3) for j in range(bc, bc + 3)}
+            peers.discard((r, c))
+            table.append(tuple(sorted(k*9 + l for k, l in peers)))
+    return table
+
+# NEIGHBORS[r*9 + c] holds the flat indices of the 20 cells sharing a row, column or box with (r, c)
+NEIGHBORS = _build_neighbors()
+
+@njit(cache=True)
+def _greedy_solve(cell_val, row_mask, col_mask, box_mask):
+    # Repeatedly fill the empty cell with the fewest candidates using its lowest candidate digit.
+    # Mutates all four arrays in place; returns False as soon as an empty cell has no candidates.
+    while True:
+        best = -1
+        best_count = 10
+        best_mask = 0
+        for i in range(81):
+            if cell_val[i] != 0:
+                continue
+            r = i // 9
+            c = i % 9
+            b = (r // 3) * 3 + c // 3
+            m = 0x1FF & ~(row_mask[r] | col_mask[c] | box_mask[b])
+            count = 0
+            t = m
+            while t:
+                t &= t - 1
+                count += 1
+            if count == 0:
+                return False
+            if count < best_count:
+                best, best_count, best_mask = i, count, m
+                if count == 1:
+                    break
+        if best < 0:
+            return True
+        d = 0
+        while not (best_mask >> d) & 1:
+            d += 1
+        bit = 1 << d
+        r = best // 9
+        c = best % 9
+        cell_val[best] = d + 1
+        row_mask[r] |= bit
+        col_mask[c] |= bit
+        box_mask[(r // 3) * 3 + c // 3] |= bit
 
 class SudokuDuel:
     STRICT_MODE = False  # If True, user can only enter correct solution values
+    RANDOM_AI = False  # If True, AI picks a uniformly random candidate instead of the least constraining one
 
     def __init__(self, root):
         self.root = root
@@ -27,18 +103,33 @@ class SudokuDuel:
         self.root.configure(bg="#ffffff")
         
         # Game state
-        self.board = [[0]*9 for _ in range(9)]
-        self.initial_board = [[0]*9 for _ in range(9)]
+        # Boards are flat 81-byte arrays indexed by r*9 + c
+        self.board = array.array('b', bytes(81))
+        self.initial_board = array.array('b', bytes(81))
+        # Used-digit bitmasks (bit d-1 set => digit d taken)
+        self.row_mask = [0]*9
+        self.col_mask = [0]*9
+        self.box_mask = [0]*9
+        # rcb_mask[r*9 + c] = row_mask[r] | col_mask[c] | box_mask[box of (r, c)]
+        self.rcb_mask = [0]*81
+        self.empty_count = 81
         self.current_turn = "user"
         self.cells = [[None]*9 for _ in range(9)]
-        self.cell_colors = [[None]*9 for _ in range(9)]
+        self.vars = [[None]*9 for _ in range(9)]
+        self.cell_colors = [[None]*9 for _ in range(9)]  # last applied (state, fg) per cell
         
+        # Priority queue of (candidate count, version, row, col, candidate mask);
+        # an entry is live only while its version matches self.ver for that cell
+        self.pq = []
+        self.ver = [0]*81
+        # Set once an empty cell is left with no candidates
+        self.dead = False
+        self.dead_cell = None
+        self.hint_cell = None  # cell currently highlighted by show_hint
+
         # Create GUI
         self.create_widgets()
         self.new_game()
-
-        # initialise priority queue
-        self.pq = []
     
     def create_widgets(self):
         self.status_label = tk.Label(self.root, text="User's Turn", 
@@ -54,7 +145,9 @@ class SudokuDuel:
                 pady_top = 2 if i % 3 == 0 and i != 0 else 0
                 padx_left = 2 if j % 3 == 0 and j != 0 else 0
                 
-                cell = tk.Entry(board_frame, width=3, font=("Helvetica", 20, "bold"),
+                self.vars[i][j] = tk.StringVar()
+                cell = tk.Entry(board_frame, textvariable=self.vars[i][j],
+                                width=3, font=("Helvetica", 20, "bold"),
                                 justify="center", bd=1, relief=tk.SOLID,
                                 bg="white", disabledbackground="white",
                                 disabledforeground="black")
@@ -70,6 +163,11 @@ class SudokuDuel:
                        variable=self.strict_var,
                        command=lambda: setattr(self, 'STRICT_MODE', self.strict_var.get()),
                        bg="#ffffff").pack(pady=5)
+        self.random_ai_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.root, text="Random AI",
+                       variable=self.random_ai_var,
+                       command=lambda: setattr(self, 'RANDOM_AI', self.random_ai_var.get()),
+                       bg="#ffffff").pack(pady=5)
         button_frame.pack(pady=20)
         
         tk.Button(button_frame, text="New Game", command=self.new_game,
@@ -83,13 +181,10 @@ class SudokuDuel:
 
     def generate_puzzle(self):
         full_board = self.shuffle_board(self.get_base_pattern())
-        self.solution_board = copy.deepcopy(full_board)
-        self.board = copy.deepcopy(full_board)
-        cells = [(i, j) for i in range(9) for j in range(9)]
-        random.shuffle(cells)
-        for i in range(random.randint(40, 45)):
-            r, c = cells[i]
-            self.board[r][c] = 0
+        self.solution_board = array.array('b', [v for row in full_board for v in row])
+        self.board = self.solution_board[:]
+        for idx in random.sample(range(81), random.randint(40, 45)):
+            self.board[idx] = 0
         return self.board
     
     def get_base_pattern(self):
@@ -99,110 +194,181 @@ class SudokuDuel:
         return [[nums[pattern(r, c)] for c in range(9)] for r in range(9)]
 
     def shuffle_board(self, board):
-        for i in range(0, 9, 3):
-            block = board[i:i+3]
-            random.shuffle(block)
-            board[i:i+3] = block
-        board = list(map(list, zip(*board)))
-        for i in range(0, 9, 3):
-            block = board[i:i+3]
-            random.shuffle(block)
-            board[i:i+3] = block
-        board = list(map(list, zip(*board)))
-        bands = [board[i:i+3] for i in range(0, 9, 3)]
-        random.shuffle(bands)
-        board = [row for band in bands for row in band]
-        board = list(map(list, zip(*board)))
-        stacks = [board[i:i+3] for i in range(0, 9, 3)]
-        random.shuffle(stacks)
-        board = [row for stack in stacks for row in stack]
-        board = list(map(list, zip(*board)))
-        return board
-
-    def is_valid(self, board, row, col, num):
-        if num in board[row]: return False
-        if num in [board[i][col] for i in range(9)]: return False
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                if board[i][j] == num: return False
-        return True
-
-    def get_candidates(self, board, row, col):
-        if board[row][col] != 0: return set()
-        candidates = set(range(1, 10))
-        candidates -= set(board[row])
-        candidates -= {board[i][col] for i in range(9)}
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                candidates.discard(board[i][j])
-        return candidates
+        # Shuffle bands/stacks and the rows/columns inside each, applied as one index permutation
+        row_perm = [3*band + i for band in random.sample(range(3), 3) for i in random.sample(range(3), 3)]
+        col_perm = [3*stack + j for stack in random.sample(range(3), 3) for j in random.sample(range(3), 3)]
+        return [[board[r][c] for c in col_perm] for r in row_perm]
+
+    def _set(self, row, col, num):
+        idx = row*9 + col
+        bit = 1 << (num - 1)
+        self.board[idx] = num
+        self.row_mask[row] ^= bit
+        self.col_mask[col] ^= bit
+        self.box_mask[BOX_OF[idx]] ^= bit
+        rcb = self.rcb_mask
+        rcb[idx] |= bit
+        for i in NEIGHBORS[idx]:
+            rcb[i] |= bit
+        self.empty_count -= 1
+
+    def _clear(self, row, col):
+        idx = row*9 + col
+        num = self.board[idx]
+        if num == 0: return
+        bit = 1 << (num - 1)
+        self.board[idx] = 0
+        self.row_mask[row] ^= bit
+        self.col_mask[col] ^= bit
+        self.box_mask[BOX_OF[idx]] ^= bit
+        # The digit may still be blocked for a peer through another unit, so recompute
+        rm, cm, bm, rcb = self.row_mask, self.col_mask, self.box_mask, self.rcb_mask
+        rcb[idx] = rm[row] | cm[col] | bm[BOX_OF[idx]]
+        for i in NEIGHBORS[idx]:
+            rcb[i] = rm[ROW_IDX[i]] | cm[COL_IDX[i]] | bm[BOX_OF[i]]
+        self.empty_count += 1
+
+    def rebuild_masks(self):
+        self.row_mask = [0]*9
+        self.col_mask = [0]*9
+        self.box_mask = [0]*9
+        self.rcb_mask = [0]*81
+        self.empty_count = 81
+        givens, self.board = self.board, array.array('b', bytes(81))
+        for i, v in enumerate(givens):
+            if v != 0:
+                self._set(ROW_IDX[i], COL_IDX[i], v)
+
+    def is_valid(self, row, col, num):
+        return not (self.rcb_mask[row*9 + col] >> (num - 1)) & 1
+
+    def get_candidates_mask(self, row, col):
+        if self.board[row*9 + col] != 0: return 0
+        return 0x1FF & ~self.rcb_mask[row*9 + col]
+
+    def get_candidates(self, row, col):
+        return set(self.mask_to_digits(self.get_candidates_mask(row, col)))
+
+    def mask_to_digits(self, mask):
+        return [i + 1 for i in BITS_OF[mask]]
+
+    def push_entry(self, idx, m):
+        self.ver[idx] += 1
+        heapq.heappush(self.pq, (POP[m], self.ver[idx], ROW_IDX[idx], COL_IDX[idx], m))
+
+    def is_stale(self, entry):
+        _, v, row, col, _ = entry
+        idx = row*9 + col
+        return v != self.ver[idx] or self.board[idx] != 0
+
+    def peek_live(self):
+        # Drop only superseded entries from the top; live entries stay queued for the AI
+        while self.pq and self.is_stale(self.pq[0]):
+            heapq.heappop(self.pq)
+        return self.pq[0] if self.pq else None
 
     def initialize_priority_queue(self):
+        # Fresh heap: every entry starts at version 1, built in one pass and heapified in O(n)
+        self.ver = [1]*81
         self.pq = []
-        for i in range(9):
-            for j in range(9):
-                if self.board[i][j] == 0:
-                    c = self.get_candidates(self.board, i, j)
-                    if c:
-                        heapq.heappush(self.pq, (len(c), i, j, c))
+        for i in range(81):
+            if self.board[i] == 0:
+                m = self.get_candidates_mask(ROW_IDX[i], COL_IDX[i])
+                self.pq.append((POP[m], 1, ROW_IDX[i], COL_IDX[i], m))
+        heapq.heapify(self.pq)
 
     def update_neighbors(self, row, col):
-        neighbours = set()
-        for i in range(9):
-            neighbours.add((row, i))
-            neighbours.add((i, col))
-        br, bc = 3 * (row // 3), 3 * (col // 3)
-        for i in range(br, br + 3):
-            for j in range(bc, bc + 3):
-                neighbours.add((i, j))
-        for r, c in neighbours:
-            if self.board[r][c] == 0:
-                cand = self.get_candidates(self.board, r, c)
-                if cand:
-                    heapq.heappush(self.pq, (len(cand), r, c, cand))
+        idx = row*9 + col
+        # A cleared cell needs a fresh entry of its own as well
+        peers = NEIGHBORS[idx] + (idx,) if self.board[idx] == 0 else NEIGHBORS[idx]
+        rcb = self.rcb_mask
+        for i in peers:
+            if self.board[i] != 0:
+                continue
+            m = self.get_candidates_mask(ROW_IDX[i], COL_IDX[i])
+            self.push_entry(i, m)
+            if m == 0:
+                self.dead = True
+                self.dead_cell = (ROW_IDX[i], COL_IDX[i])
+        if self.dead and self.board[idx] == 0:
+            # A cleared cell may have freed the dead cell; look for any remaining one
+            self.dead_cell = next(((ROW_IDX[i], COL_IDX[i]) for i in range(81)
+                                   if self.board[i] == 0 and rcb[i] == 0x1FF), None)
+            self.dead = self.dead_cell is not None
+        # Superseded entries pile up between pops; rebuild once they dominate the heap
+        if len(self.pq) > 4 * self.empty_count:
+            self.initialize_priority_queue()
 
     def ai_make_move(self):
+        if self.dead:
+            return False
         while self.pq:
-            _, row, col, _ = heapq.heappop(self.pq)
-            if self.board[row][col] != 0:
+            entry = heapq.heappop(self.pq)
+            if self.is_stale(entry):
                 continue
-            candidates = self.get_candidates(self.board, row, col)
-            if not candidates:
+            _, _, row, col, mask = entry
+            if not mask:
                 return False
-            value = random.choice(list(candidates))
-            self.board[row][col] = value
-            self.cells[row][col].config(state="normal")
-            self.cells[row][col].delete(0, tk.END)
-            self.cells[row][col].insert(0, str(value))
-            self.cells[row][col].config(fg="red", state="disabled")
-            self.update_neighbors(row, col)
+            if self.RANDOM_AI:
+                value = random.choice(BITS_OF[mask]) + 1
+            else:
+                value = self.least_constraining_value(row*9 + col, mask)
+            self.place_ai_value(row, col, value)
+            self.propagate_singles()
             return True
         return False
 
+    def least_constraining_value(self, idx, mask):
+        # Prefer the digit that removes a candidate from the fewest empty peers
+        if POP[mask] == 1:
+            return LOWEST[mask] + 1
+        rcb, board = self.rcb_mask, self.board
+        empty_peers = [rcb[i] for i in NEIGHBORS[idx] if board[i] == 0]
+        best = min(BITS_OF[mask], key=lambda d: sum(not (used >> d) & 1 for used in empty_peers))
+        return best + 1
+
+    def place_ai_value(self, row, col, value):
+        self._set(row, col, value)
+        self.vars[row][col].set(str(value))
+        self.style_cell(row, col, "disabled", "red")
+        self.update_neighbors(row, col)
+
+    def propagate_singles(self):
+        # Fill forced cells (exactly one candidate) straight off the top of the heap
+        while True:
+            entry = self.peek_live()
+            if entry is None or entry[0] != 1:
+                break
+            heapq.heappop(self.pq)
+            _, _, row, col, mask = entry
+            self.place_ai_value(row, col, LOWEST[mask] + 1)
+
     def on_cell_edit(self, row, col):
-        if self.current_turn != "user" or self.initial_board[row][col] != 0:
+        if self.current_turn != "user" or self.initial_board[row*9 + col] != 0:
             return
         cell = self.cells[row][col]
         v = cell.get().strip()
         if v == "":
-            self.board[row][col] = 0
+            if self.board[row*9 + col] != 0:
+                self._clear(row, col)
+                self.update_neighbors(row, col)
             return
         try:
             num = int(v)
             if not (1 <= num <= 9): raise ValueError
-            self.board[row][col] = 0
+            if self.board[row*9 + col] != 0:
+                self._clear(row, col)
+                self.update_neighbors(row, col)
             # Strict mode: must match solution
-            if self.STRICT_MODE and num != self.solution_board[row][col]:
+            if self.STRICT_MODE and num != self.solution_board[row*9 + col]:
                 messagebox.showerror("Incorrect", "That is not the correct value for this cell.")
                 cell.delete(0, tk.END)
                 return
 
-            if self.is_valid(self.board, row, col, num):
-                self.board[row][col] = num
+            if self.is_valid(row, col, num):
+                self._set(row, col, num)
                 self.update_neighbors(row, col)
-                cell.config(fg="blue")
+                self.style_cell(row, col, "normal", "blue")
                 self.current_turn = "ai"
                 self.status_label.config(text="AI is Thinking...")
                 self.root.after(300, self.ai_turn)
@@ -213,7 +379,7 @@ class SudokuDuel:
 
     def ai_turn(self):
         if not self.ai_make_move():
-            messagebox.showinfo("Game Over", "AI cannot make a move!")
+            self.show_ai_stuck()
             return
         if self.is_complete():
             messagebox.showinfo("Game Over", "Puzzle Complete!")
@@ -221,48 +387,94 @@ class SudokuDuel:
         self.current_turn = "user"
         self.status_label.config(text="User's Turn")
 
+    def show_ai_stuck(self):
+        if self.dead:
+            r, c = self.dead_cell
+            messagebox.showinfo("Game Over", f"AI cannot make a move! Row {r+1}, Col {c+1} has no candidates.")
+        else:
+            messagebox.showinfo("Game Over", "AI cannot make a move!")
+
     def is_complete(self):
-        return all(self.board[i][j] != 0 for i in range(9) for j in range(9))
+        return self.empty_count == 0
 
     def new_game(self):
         self.board = self.generate_puzzle()
-        self.initial_board = copy.deepcopy(self.board)
+        self.initial_board = self.board[:]
+        self.rebuild_masks()
+        self.dead = False
+        self.dead_cell = None
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()
         self.status_label.config(text="User's Turn")
 
+    def style_cell(self, row, col, state, fg):
+        if self.cell_colors[row][col] != (state, fg):
+            self.cells[row][col].config(state=state, fg=fg)
+            self.cell_colors[row][col] = (state, fg)
+
     def render_board(self):
+        # Only touch Tk where the displayed text or style actually changes
         for i in range(9):
             for j in range(9):
-                cell = self.cells[i][j]
-                cell.config(state="normal")
-                cell.delete(0, tk.END)
-                if self.board[i][j] != 0:
-                    cell.insert(0, str(self.board[i][j]))
-                    if self.initial_board[i][j] != 0:
-                        cell.config(fg="black", state="disabled")
-                    else:
-                        cell.config(fg="blue")
+                v = self.board[i*9 + j]
+                text = str(v) if v else ""
+                if self.vars[i][j].get() != text:
+                    self.vars[i][j].set(text)
+                if v == 0:
+                    self.style_cell(i, j, "normal", "black")
+                elif self.initial_board[i*9 + j] != 0:
+                    self.style_cell(i, j, "disabled", "black")
+                else:
+                    self.style_cell(i, j, "normal", "blue")
 
     def show_hint(self):
-        self.initialize_priority_queue()
-        if not self.pq:
+        entry = self.peek_live()
+        if entry is None:
             messagebox.showinfo("Hint", "No empty cells remaining!")
             return
-        _, row, col, _ = self.pq[0]
-        for i in range(9):
-            for j in range(9):
-                self.cells[i][j].config(bg="white")
+        _, _, row, col, _ = entry
+        if self.hint_cell is not None:
+            r, c = self.hint_cell
+            self.cells[r][c].config(bg="white")
         self.cells[row][col].config(bg="#ffeb3b")
-        cand = sorted(self.get_candidates(self.board, row, col))
+        self.hint_cell = (row, col)
+        cand = sorted(self.get_candidates(row, col))
         messagebox.showinfo("Hint", f"Most constrained cell: Row {row+1}, Col {col+1}\nCandidates: {cand}")
 
     def ai_play(self):
-        self.ai_make_move()
+        # Greedy-solve the rest of the board in one go, then show every AI placement at once
+        if self.current_turn != "user":
+            return
+        if self.dead:
+            self.show_ai_stuck()
+            return
+        state = [list(self.board), self.row_mask[:], self.col_mask[:], self.box_mask[:]]
+        if np is not None:
+            state = [np.array(a, dtype=np.int32) for a in state]
+        solved = _greedy_solve(*state)
+        for i, v in enumerate(state[0]):
+            if v and self.board[i] == 0:
+                r, c = ROW_IDX[i], COL_IDX[i]
+                self._set(r, c, int(v))
+                self.vars[r][c].set(str(v))
+                self.style_cell(r, c, "disabled", "red")
+        self.initialize_priority_queue()
+        self.current_turn = "over"
+        self.status_label.config(text="Game Over")
+        if solved:
+            messagebox.showinfo("Game Over", "Puzzle Complete!")
+        else:
+            self.dead_cell = next((ROW_IDX[i], COL_IDX[i]) for i in range(81)
+                                  if self.board[i] == 0 and self.rcb_mask[i] == 0x1FF)
+            self.dead = True
+            self.show_ai_stuck()
 
     def reset_board(self):
-        self.board = copy.deepcopy(self.initial_board)
+        self.board = self.initial_board[:]
+        self.rebuild_masks()
+        self.dead = False
+        self.dead_cell = None
         self.current_turn = "user"
         self.initialize_priority_queue()
         self.render_board()